@@ -0,0 +1,48 @@
+"""Session fixtures that build each Verilator model once per pytest run
+
+With pytest-xdist every worker runs these fixtures, so the build is done
+behind a file lock and stamped with the run id. The first worker to get the
+lock builds the model, the rest see the stamp and go straight to the tests.
+"""
+import fcntl
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+
+@contextmanager
+def _build_lock(name):
+    """Hold an exclusive lock on sim_build/<name>.lock"""
+    Path("sim_build").mkdir(exist_ok=True)
+    with open(f"sim_build/{name}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _build_once(name, build):
+    """Run build() unless another worker already did it during this run"""
+    run_id = os.environ.get("PYTEST_XDIST_TESTRUNUID")
+    stamp = Path(f"sim_build/{name}.built")
+    with _build_lock(name):
+        if run_id is not None and stamp.exists() and stamp.read_text() == run_id:
+            return
+        build()
+        if run_id is not None:
+            stamp.write_text(run_id)
+
+
+@pytest.fixture(scope="session")
+def reciever_prefix_model():
+    from tbc_reciever_prefix import reciever_prefix_build
+    _build_once("top_reciever_prefix", reciever_prefix_build)
+
+
+@pytest.fixture(scope="session")
+def window_filter_model():
+    from tbc_window_filter import window_filter_build
+    _build_once("top_window_filter", window_filter_build)
@@ -0,0 +1,172 @@
+//-----------------------------------------------------------------------------
+// Title      : MIL-STD-1553 Receiver Test Bench Top
+// Project    : MIL-STD-1553 Adapter
+//-----------------------------------------------------------------------------
+// File       : reciever_tb_top.sv
+// Author     :
+// Company    :
+// Created    :
+// Last update:
+// Platform   :
+// Standard   : SystemVerilog
+// Test Bench : tbc_reciever.py
+//-----------------------------------------------------------------------------
+// Description:
+// Simulation-only wrapper around the reciever module. It performs:
+//   - Generation of i_clk inside the simulator
+//   - Pass-through of all reciever ports to the cocotb test bench
+//   - Stimulus ROM loaded 64 chips at a time from the test bench
+//   - Playback of the ROM into i_data_in, one chip every BASE_DUR_NS
+//
+// The test bench loads a whole word of chips, pulses i_start and then only
+// waits for o_data_valid. No Python code runs per chip, which removes the
+// per-chip Timer callbacks and value writes across the VPI boundary.
+// While the ROM is idle i_data_in is passed straight to the receiver.
+//-----------------------------------------------------------------------------
+// Copyright (c)
+//-----------------------------------------------------------------------------
+// Revisions  :
+// Date        Version  Author  Description
+//-----------------------------------------------------------------------------
+
+module reciever_tb_top #(
+    parameter int unsigned MASTER_CLK_FREQ_HZ = 100_000_000,  // Master clock frequency in Hz
+    parameter int unsigned MAN_BIT_RATE_HZ    = 1_000_000  ,  // Bit rate in Hz
+    parameter logic        EN_WINDOW_FILTER   = 1'b0       ,  // Enable time window filtering
+    parameter int unsigned WINDOW_LATE_NS     = 50         ,  // Time window late tolerance in nanoseconds
+    parameter int unsigned WINDOW_EARLY_NS    = 50         ,  // Time window early tolerance in nanoseconds
+    parameter int unsigned DUR_AFTER_LAST_CHIP_NS     = 1000, // See reciever.sv
+    parameter logic        EN_COUNT_RESET_ON_CHIP_END = 1'b0, // See reciever.sv
+
+    parameter int unsigned BASE_DUR_NS   = 500,   // Duration of a single chip in nanoseconds
+    parameter int unsigned CLK_PERIOD_NS = 10 ,   // Period of i_clk in nanoseconds
+    parameter int unsigned ROM_DEPTH     = 256,   // Maximum number of chips held in the ROM
+
+    localparam int unsigned ROM_IDX_WIDTH = $clog2(ROM_DEPTH + 1)
+) (
+
+    input   logic    i_reset,        // System reset
+
+    input   logic    i_en,           // Enable receiver
+
+    input   logic    i_data_in,      // Manchester encoded data input (used while ROM is idle)
+
+    output  logic    o_data_valid,   // Data output valid signal
+    input   logic    i_data_ready,   // Data output ready signal
+
+    input   logic    i_fail_clear,   // Clear fail state signal
+    output  logic    o_fail_flag,    // Fail flag output
+
+    output  lib_1553::word_t          o_data_word,   // Received data output
+    output  lib_1553::word_type_t     o_word_type,   // Received word type output
+    output  lib_1553::rx_fail_flags_t o_fail_flags,  // Detailed fail flags output
+
+    input   logic                     i_rom_load,    // Store i_rom_data at the current write pointer
+    input   logic [ROM_IDX_WIDTH-1:0] i_rom_len,     // Number of chips to play back
+    input   logic [63:0]              i_rom_data,    // 64 chips, MSB is played first
+    input   logic                     i_start,       // Start playback from chip 0
+
+    output  logic                     o_rom_busy     // High while the ROM is driving the receiver
+);
+
+    localparam int unsigned CYCLES_PER_CHIP = BASE_DUR_NS / CLK_PERIOD_NS;
+    localparam int unsigned CYCLE_WIDTH     = $clog2(CYCLES_PER_CHIP + 1);
+
+
+// ----------------------------------------------------------------------------
+// Clock Generation
+// ----------------------------------------------------------------------------
+
+    logic i_clk = 1'b0;
+
+    always #(CLK_PERIOD_NS / 2.0) i_clk = ~i_clk;
+
+
+// ----------------------------------------------------------------------------
+// Stimulus ROM
+// ----------------------------------------------------------------------------
+
+    logic                     rom [ROM_DEPTH];
+    logic [ROM_IDX_WIDTH-1:0] rom_wr_ptr = '0;
+    logic [ROM_IDX_WIDTH-1:0] rom_rd_ptr = '0;
+    logic [ROM_IDX_WIDTH-1:0] rom_len    = '0;
+    logic [CYCLE_WIDTH-1:0]   chip_cycle = '0;
+    logic                     rom_busy   = 1'b0;
+
+    always_ff @(posedge i_clk) begin
+        if (i_reset) begin
+            rom_wr_ptr <= '0;
+            rom_rd_ptr <= '0;
+            chip_cycle <= '0;
+            rom_busy   <= 1'b0;
+        end
+        else if (i_rom_load) begin
+            for (int k = 0; k < 64; k++) begin
+                if (int'(rom_wr_ptr) + k < ROM_DEPTH) begin
+                    rom[int'(rom_wr_ptr) + k] <= i_rom_data[63 - k];
+                end
+            end
+            rom_wr_ptr <= rom_wr_ptr + ROM_IDX_WIDTH'(64);
+        end
+        else if (i_start) begin
+            rom_wr_ptr <= '0;       // Next load starts a new word
+            rom_rd_ptr <= '0;
+            rom_len    <= i_rom_len;
+            chip_cycle <= '0;
+            rom_busy   <= (i_rom_len != '0);
+        end
+        else if (rom_busy) begin
+            if (chip_cycle == CYCLE_WIDTH'(CYCLES_PER_CHIP - 1)) begin
+                chip_cycle <= '0;
+                rom_rd_ptr <= rom_rd_ptr + 1'b1;
+                rom_busy   <= (rom_rd_ptr + 1'b1 != rom_len);
+            end
+            else begin
+                chip_cycle <= chip_cycle + 1'b1;
+            end
+        end
+    end
+
+    logic rom_chip;     always_comb rom_chip = rom_busy ? rom[rom_rd_ptr] : i_data_in;
+
+    assign o_rom_busy = rom_busy;
+
+
+// ----------------------------------------------------------------------------
+// Device Under Test
+// ----------------------------------------------------------------------------
+
+    reciever #(
+        .MASTER_CLK_FREQ_HZ         (MASTER_CLK_FREQ_HZ        ),
+        .MAN_BIT_RATE_HZ            (MAN_BIT_RATE_HZ           ),
+        .EN_WINDOW_FILTER           (EN_WINDOW_FILTER          ),
+        .WINDOW_LATE_NS             (WINDOW_LATE_NS            ),
+        .WINDOW_EARLY_NS            (WINDOW_EARLY_NS           ),
+        .DUR_AFTER_LAST_CHIP_NS     (DUR_AFTER_LAST_CHIP_NS    ),
+        .EN_COUNT_RESET_ON_CHIP_END (EN_COUNT_RESET_ON_CHIP_END)
+    ) reciever_uut (
+        .i_clk        (i_clk       ),
+        .i_reset      (i_reset     ),
+        .i_en         (i_en        ),
+        .i_data_in    (rom_chip    ),
+        .o_data_valid (o_data_valid),
+        .i_data_ready (i_data_ready),
+        .i_fail_clear (i_fail_clear),
+        .o_fail_flag  (o_fail_flag ),
+        .o_data_word  (o_data_word ),
+        .o_word_type  (o_word_type ),
+        .o_fail_flags (o_fail_flags)
+    );
+
+
+// ----------------------------------------------------------------------------
+// Assertions/Compile Checks
+// ----------------------------------------------------------------------------
+
+    initial begin
+        assert (CYCLES_PER_CHIP > 0) else begin
+            $fatal("reciever_tb_top: BASE_DUR_NS must be at least CLK_PERIOD_NS");
+        end
+    end
+
+endmodule // reciever_tb_top
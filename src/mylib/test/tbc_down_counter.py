@@ -1,6 +1,5 @@
 import cocotb
-from cocotb.clock import Clock
-from cocotb.triggers import RisingEdge, FallingEdge, Timer
+from cocotb.triggers import ClockCycles, RisingEdge, FallingEdge, Timer
 from cocotb_tools.runner import get_runner
 import os
 
@@ -9,168 +8,176 @@ import os
 cycle_count = 17
 counter_width = 3
 
-def read_uint(signal):
-	"""Helper function to read unsigned integer value from a signal"""
-	return signal.value.to_unsigned()
+def get_count(count):
+	"""Helper function to get current count value from the bound o_count handle"""
+	return int(count.value)
 
-def get_count(dut):
-	"""Helper function to get current count value from DUT"""
-	return read_uint(dut.o_count)
+def is_done(done):
+	"""Helper function to check if the bound o_done handle is asserted"""
+	return done.value == 1
 
-def is_done(dut):
-	"""Helper function to check if done signal is asserted"""
-	return dut.o_done.value == 1
+def is_busy(busy):
+	"""Helper function to check if the bound o_busy handle is asserted"""
+	return busy.value == 1
 
-def is_busy(dut):
-	"""Helper function to check if busy signal is asserted"""
-	return dut.o_busy.value == 1
+
+async def _prolog(dut):
+	"""Sync to the clock generated by the test bench top"""
+	await RisingEdge(dut.i_clk)
 
 
 @cocotb.test()
 async def test_down_counter_basic(dut):
     """Test basic countdown functionality"""
     
-    # Start clock
-    clock = Clock(dut.i_clk, 10, unit="ns")
-    clock.start(start_high=False)
-    await RisingEdge(dut.i_clk)
+    # Bind signal handles once
+    clk, clear, en = dut.i_clk, dut.i_clear, dut.i_en
+    count, busy, done = dut.o_count, dut.o_busy, dut.o_done
+
+    # Sync to clock
+    await _prolog(dut)
     
     # Initialize inputs
-    dut.i_clear.value = 0
-    dut.i_en.value = 0
-    await RisingEdge(dut.i_clk)
-    await RisingEdge(dut.i_clk)
+    clear.value = 0
+    en.value = 0
+    await RisingEdge(clk)
+    await RisingEdge(clk)
     # Clear the counter (load initial value)
-    dut.i_clear.value = 1
-    await RisingEdge(dut.i_clk)
-    await RisingEdge(dut.i_clk)
+    clear.value = 1
+    await RisingEdge(clk)
+    await RisingEdge(clk)
     # Verify counter loaded
-    assert get_count(dut) == cycle_count, f"[T0] Expected count={cycle_count} after clear, got {get_count(dut)}"
+    assert get_count(count) == cycle_count, f"[T0] Expected count={cycle_count} after clear, got {get_count(count)}"
     # Check initial state
-    assert get_count(dut) == cycle_count, f"[T1] Expected count={cycle_count}, got {get_count(dut)}"
-    assert is_busy(dut),                  f"[T1] Expected o_busy=1, got {is_busy(dut)}"
-    assert not is_done(dut),              f"[T1] Expected o_done=0, got {is_done(dut)}"
+    assert get_count(count) == cycle_count, f"[T1] Expected count={cycle_count}, got {get_count(count)}"
+    assert is_busy(busy),                   f"[T1] Expected o_busy=1, got {is_busy(busy)}"
+    assert not is_done(done),               f"[T1] Expected o_done=0, got {is_done(done)}"
 
 
 @cocotb.test()
 async def test_down_counter_countdown(dut):
     """Test countdown operation"""
     
-    clock = Clock(dut.i_clk, 10, unit="ns")
-    clock.start(start_high=False)
-    await RisingEdge(dut.i_clk)
+    # Bind signal handles once
+    clk, clear, en, count = dut.i_clk, dut.i_clear, dut.i_en, dut.o_count
+
+    await _prolog(dut)
 	
 	# Initialize
-    dut.i_clear.value = 1		# Load initial value
-    dut.i_en.value = 0          # Disable counting
-    await RisingEdge(dut.i_clk) # Let load take effect
-    dut.i_clear.value = 0       # Release clear
-    await RisingEdge(dut.i_clk) # Next clock
+    clear.value = 1         # Load initial value
+    en.value = 0            # Disable counting
+    await RisingEdge(clk)   # Let load take effect
+    clear.value = 0         # Release clear
+    await RisingEdge(clk)   # Next clock
 	
     # Enable counting
-    dut.i_en.value = 1
+    en.value = 1
 	
 	# Count down completely
     for expected_count in range(cycle_count, -1, -1):
-        await RisingEdge(dut.i_clk)
-        assert dut.o_count.value == expected_count , f"[T2] Expected count={expected_count}, got {dut.o_count.value}"
+        await RisingEdge(clk)
+        got = count.value   # Single read, reused by the message on failure
+        assert got == expected_count, f"[T2] Expected count={expected_count}, got {got}"
 
 
 @cocotb.test()
 async def test_down_counter_clear_during_count(dut):
     """Test clear signal during countdown"""
     
-    clock = Clock(dut.i_clk, 10, unit="ns")
-    clock.start(start_high=False)
-    await RisingEdge(dut.i_clk)
+    # Bind signal handles once
+    clk, clear, en = dut.i_clk, dut.i_clear, dut.i_en
+    count, busy, done = dut.o_count, dut.o_busy, dut.o_done
+
+    await _prolog(dut)
 
     # Initialize
-    dut.i_clear.value = 1
-    dut.i_en.value = 0
-    await RisingEdge(dut.i_clk)
-    dut.i_clear.value = 0
-    await RisingEdge(dut.i_clk)
+    clear.value = 1
+    en.value = 0
+    await RisingEdge(clk)
+    clear.value = 0
+    await RisingEdge(clk)
     
     # Count down partway
-    dut.i_en.value = 1
-    for i in range(8):
-        await RisingEdge(dut.i_clk)
+    en.value = 1
+    await ClockCycles(clk, 8)
     
-    mid_count = get_count(dut)
+    mid_count = get_count(count)
     dut._log.info(f"[T8] Mid-countdown: count={mid_count}")
     
     # Apply clear during countdown
-    dut.i_clear.value = 1
-    await RisingEdge(dut.i_clk)
-    dut.i_clear.value = 0
-    await RisingEdge(dut.i_clk)
+    clear.value = 1
+    await RisingEdge(clk)
+    clear.value = 0
+    await RisingEdge(clk)
     
     # Verify counter reloaded
-    assert get_count(dut) == cycle_count, f"[T8] Expected count reset to {cycle_count}, got {get_count(dut)}"
-    assert dut.o_busy.value == 1, f"[T8] Expected o_busy=1 after clear"
-    assert dut.o_done.value == 0, f"[T8] Expected o_done=0 after clear"
+    assert get_count(count) == cycle_count, f"[T8] Expected count reset to {cycle_count}, got {get_count(count)}"
+    assert busy.value == 1, f"[T8] Expected o_busy=1 after clear"
+    assert done.value == 0, f"[T8] Expected o_done=0 after clear"
 
 
 @cocotb.test()
 async def test_down_counter_boundary(dut):
     """Test boundary conditions"""
     
-    clock = Clock(dut.i_clk, 10, unit="ns")
-    clock.start(start_high=False)
-    await RisingEdge(dut.i_clk)
+    # Bind signal handles once
+    clk, clear, en = dut.i_clk, dut.i_clear, dut.i_en
+    count, busy, done = dut.o_count, dut.o_busy, dut.o_done
+
+    await _prolog(dut)
     
     # Initialize
-    dut.i_clear.value = 1
-    dut.i_en.value = 0
-    await RisingEdge(dut.i_clk)
-    dut.i_clear.value = 0
-    await RisingEdge(dut.i_clk)
+    clear.value = 1
+    en.value = 0
+    await RisingEdge(clk)
+    clear.value = 0
+    await RisingEdge(clk)
     
     # Test transition from 1 to 0
-    dut.i_en.value = 1
-    for i in range(cycle_count):
-        await RisingEdge(dut.i_clk)
+    en.value = 1
+    await ClockCycles(clk, cycle_count)
     
     # Should be at count=1
-    assert get_count(dut) == 1, f"[T10] Expected count=1, got {get_count(dut)}"
-    assert dut.o_busy.value == 1, f"[T10] Expected o_busy=1 at count=1"
-    assert dut.o_done.value == 0, f"[T10] Expected o_done=0 at count=1"
+    assert get_count(count) == 1, f"[T10] Expected count=1, got {get_count(count)}"
+    assert busy.value == 1, f"[T10] Expected o_busy=1 at count=1"
+    assert done.value == 0, f"[T10] Expected o_done=0 at count=1"
     
     # Next cycle should go to 0
-    await RisingEdge(dut.i_clk)
-    assert get_count(dut) == 0, f"[T10] Expected count=0, got {get_count(dut)}"
-    assert dut.o_busy.value == 0, f"[T10] Expected o_busy=0 at count=0"
-    assert dut.o_done.value == 1, f"[T10] Expected o_done=1 at count=0"
+    await RisingEdge(clk)
+    assert get_count(count) == 0, f"[T10] Expected count=0, got {get_count(count)}"
+    assert busy.value == 0, f"[T10] Expected o_busy=0 at count=0"
+    assert done.value == 1, f"[T10] Expected o_done=1 at count=0"
 
 
 @cocotb.test()
 async def test_down_counter_clear_priority(dut):
     """Test that clear has priority over enable"""
     
-    clock = Clock(dut.i_clk, 10, unit="ns")
-    clock.start(start_high=False)
-    await RisingEdge(dut.i_clk)
+    # Bind signal handles once
+    clk, clear, en, count = dut.i_clk, dut.i_clear, dut.i_en, dut.o_count
+
+    await _prolog(dut)
     
     # Initialize
-    dut.i_clear.value = 0
-    dut.i_en.value = 0
-    await RisingEdge(dut.i_clk)
+    clear.value = 0
+    en.value = 0
+    await RisingEdge(clk)
     
     # Apply both clear and enable simultaneously
-    dut.i_clear.value = 1
-    dut.i_en.value = 1
-    await RisingEdge(dut.i_clk)
-    await RisingEdge(dut.i_clk)
+    clear.value = 1
+    en.value = 1
+    await RisingEdge(clk)
+    await RisingEdge(clk)
     
     # Clear should take priority
-    assert get_count(dut) == cycle_count, f"[T11] Clear should have priority, expected count={cycle_count}"
+    assert get_count(count) == cycle_count, f"[T11] Clear should have priority, expected count={cycle_count}"
     
-    dut.i_clear.value = 0
-    await RisingEdge(dut.i_clk)
-    await RisingEdge(dut.i_clk)
+    clear.value = 0
+    await RisingEdge(clk)
+    await RisingEdge(clk)
     
     # Now enable should work
-    assert get_count(dut) == cycle_count - 1, f"[T11] After clear released, should count down"
+    assert get_count(count) == cycle_count - 1, f"[T11] After clear released, should count down"
 
 
 def test_down_counter_runner():
@@ -179,23 +186,35 @@ def test_down_counter_runner():
     proj_path = "/home/cody/workspace/mil_adapter"
     print(f"Project Path: {proj_path}")
     
-    # Enable waveform tracing
-    os.environ["TRACES"] = "1"
+    # Waveform tracing is off by default. Enable per run with WAVES=1
+    trace = os.environ.get("WAVES", "0") == "1"
+    rebuild = os.environ.get("REBUILD", "0") == "1"
+    if trace:
+        os.environ["TRACES"] = "1"
     
+    hdl_toplevel = "top_down_counter"
+
     runner = get_runner(sim)
     runner.build(
-        sources=[f"{proj_path}/src/mylib/down_counter.sv"],
-        hdl_toplevel="down_counter",
-        always=True,
+        sources=[
+            f"{proj_path}/src/mylib/down_counter.sv",
+            f"{proj_path}/src/mylib/test/top_down_counter.sv",
+        ],
+        hdl_toplevel=hdl_toplevel,
+        build_dir=f"sim_build/{hdl_toplevel}",   # Per-DUT build so runners can run in parallel
+        clean=rebuild,                            # REBUILD=1 wipes build_dir first
+        timescale=("1ns", "1ps"),                 # Default for every module; none of the sources declare one
         parameters={
             "CYCLE_COUNT": cycle_count,
             "COUNTER_WIDTH": counter_width
         },
-        build_args=["--trace-fst", "--trace-structs"]
+        waves=trace,
+        build_args=["--timing"] + (["--trace-fst", "--trace-structs"] if trace else [])
     )
     
     runner.test(
-        hdl_toplevel="down_counter",
+        hdl_toplevel=hdl_toplevel,
+        waves=trace,
         test_module="tbc_down_counter",
     )
 
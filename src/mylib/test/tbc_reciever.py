@@ -1,45 +1,54 @@
 import cocotb
-from cocotb.clock import Clock
-from cocotb.triggers import RisingEdge, FallingEdge, ReadOnly, NextTimeStep, Timer
+from cocotb.handle import Immediate
+from cocotb.triggers import ClockCycles, First, RisingEdge, FallingEdge, ReadOnly, NextTimeStep, Timer
 from cocotb_tools.runner import get_runner
 import os
 import sys
 
 # Import test utilities
 from test_tools import *
+from test_tools import _CHIPS
+
+
+# Every chip lasts the same time, so one duration replaces a per-chip delay list.
+# Passed to reciever_tb_top, which holds each ROM chip for this long.
+BASE_DUR_NS   = 500
+CLK_PERIOD_NS = 10
 
 
 # ----------------------------------------------------------------------------
 # Helper Functions
 # ----------------------------------------------------------------------------
 
-async def reset_dut(dut):
-    """Reset the DUT"""
-    dut.i_reset.value = 1
+async def _prolog(dut):
+    """Sync to the clock generated by the test bench top"""
     await RisingEdge(dut.i_clk)
+
+
+async def reset_dut(dut):
+    """Reset the DUT with a single clock of i_reset"""
+    dut.i_reset.value = Immediate(1)
     await RisingEdge(dut.i_clk)
     dut.i_reset.value = 0
-    await RisingEdge(dut.i_clk)
-    await RisingEdge(dut.i_clk)
 
 
-async def init_dut(dut):
-    """Initialize DUT inputs to safe defaults"""
-    dut.i_en.value = 0
-    dut.i_data_in.value = 0
-    dut.i_data_ready.value = 0
-    dut.i_fail_clear.value = 0
-    await RisingEdge(dut.i_clk)
-    await RisingEdge(dut.i_clk)
+def init_dut(dut):
+    """Initialize DUT inputs to safe defaults before the next clock edge"""
+    dut.i_en.value = Immediate(0)
+    dut.i_data_in.value = Immediate(0)
+    dut.i_data_ready.value = Immediate(0)
+    dut.i_fail_clear.value = Immediate(0)
+    dut.i_rom_load.value = Immediate(0)
+    dut.i_start.value = Immediate(0)
     
 
 def print_dut_state(dut):
     """Print the internal state of the DUT for debugging"""
     try:
-        state = dut.current_state.value
+        state = dut.reciever_uut.current_state.value
         dut._log.info(f"DUT State: state={state}")
         dut._log.info(f"  Outputs: valid={dut.o_data_valid.value}, fail={dut.o_fail_flag.value}")
-        dut._log.info(f"  Data out: type={dut.o_data_out.word_type.value}, word=0x{dut.o_data_out.data_word.value:04X}")
+        dut._log.info(f"  Data out: type={dut.o_word_type.value}, word=0x{int(dut.o_data_word.value):04X}")
     except Exception as e:
         dut._log.warning(f"Could not read internal state: {e}")
 
@@ -60,14 +69,12 @@ async def test_receiver_reset(dut):
     dut._log.info("Test: Receiver Reset")
     dut._log.info("="*60)
     
-    # Create clock
-    clock = Clock(dut.i_clk, 10, "ns")  # 100 MHz
-    clock.start(start_high=False)
-    await RisingEdge(dut.i_clk)
+    # Sync to clock
+    await _prolog(dut)
     
     # Apply reset
     await reset_dut(dut)
-    await init_dut(dut)
+    init_dut(dut)
     
     # Check initial state
     await ReadOnly()
@@ -86,22 +93,19 @@ async def test_receiver_idle(dut):
     dut._log.info("Test: Receiver Idle State")
     dut._log.info("="*60)
     
-    # Create clock
-    clock = Clock(dut.i_clk, 10, "ns")
-    clock.start(start_high=False)
-    await RisingEdge(dut.i_clk)
+    # Sync to clock
+    await _prolog(dut)
     
     # Reset and initialize
     await reset_dut(dut)
-    await init_dut(dut)
+    init_dut(dut)
     
     # Enable receiver but send no data
     dut.i_en.value = 1
     dut.i_data_in.value = 0
     
     # Wait several cycles
-    for _ in range(100):
-        await RisingEdge(dut.i_clk)
+    await ClockCycles(dut.i_clk, 100)
     
     # Verify still idle
     await ReadOnly()
@@ -143,64 +147,43 @@ class SignalWriter:
 
 
 
+
+
 def generate_values_sequence(is_cmd_word: bool, data: int, initial_zero_count=20) -> list[int]:
     """Generate the full value sequence for a MIL-1553 word transmission"""
-    values = []
-    
-    # Pad with initial zeros
-    values += [0] * initial_zero_count
-    
-    # Generate sync pattern
-    if is_cmd_word:
-        values += generate_sync_pattern(True)
-    else:
-        values += generate_sync_pattern(False)
-    
-    # Generate data bits
-    data_bits = msb_int_2_bit_list(data, 16)
-    values += data_bits
-    
-    # Generate parity bit
-    parity_value = calculate_odd_parity(data_bits);
-    values += generate_manchester_chip(parity_value)
+    data_bits    = msb_int_2_bit_list(data, 16)
+    parity_value = int(calculate_odd_parity(data))
+
+    values  = [0] * initial_zero_count                                   # Pad with initial zeros
+    values += generate_sync_pattern(is_cmd_word)                         # Sync pattern
+    values += [chip for bit in data_bits for chip in _CHIPS[bit]]        # Data bits
+    values += _CHIPS[parity_value]                                       # Parity bit
     
     debug(f"Given data: 0x{data:04X}, bits: {data_bits}, parity: {parity_value}")
     debug(f"Generated values sequence: {values}")
     
     return values
 
-def generate_delays_sequence(num_initial_zeroes=20, base_duration_ns=500) -> list[int]:
-	"""Generate the full delays sequence for a MIL-1553 word transmission"""
-	delays = []
-	
-	# Initial zeros
-	delays += [base_duration_ns] * num_initial_zeroes
-	
-	# Sync pattern (6 chips)
-	delays += [base_duration_ns] * 6 * 2
-	
-	# Data bits (16 bits)
-	delays += [base_duration_ns] * 16 * 2
-	
-	# Parity bit (1 bit)
-	delays += [base_duration_ns] * 1 * 2
-	
-	debug(f"Generated delays sequence: {delays}")
-	
-	return delays
+async def load_rom(dut, values: list[int]):
+	"""Load a chip sequence into the stimulus ROM (64 chips per write) and start playback"""
+	clk, rom_data, rom_load, start = dut.i_clk, dut.i_rom_data, dut.i_rom_load, dut.i_start
 
+	# A longer sequence would run past the end of the ROM and play back stale chips
+	rom_depth = int(dut.ROM_DEPTH.value)
+	assert len(values) <= rom_depth, f"{len(values)} chips do not fit in the {rom_depth} chip stimulus ROM"
 
-async def send_signals(dut, values: list[int], delays_ns: list[int]):
-	"""Send a sequence of values to the DUT input signal with specified delays"""
-	
-	if len(values) != len(delays_ns):
-		raise ValueError("values and delays_ns must have the same length")
-    
-	for i, (value, delay) in enumerate(zip(values, delays_ns)):
+	dut.i_rom_len.value = len(values)
 
-		dut.i_data_in.value = value
+	for i in range(0, len(values), 64):
+		chunk = values[i:i + 64]
+		rom_data.value = msb_bit_list_2_int(chunk) << (64 - len(chunk))
+		rom_load.value = 1
+		await RisingEdge(clk)
 
-		await Timer(delay, units='ns')
+	rom_load.value = 0
+	start.value = 1
+	await RisingEdge(clk)
+	start.value = 0
           
 
 @cocotb.test()
@@ -209,38 +192,38 @@ async def test_signal_writer(dut):
 	# log = cocotb.logging.getLogger("SignalWriterTest")
 	
 	# Generate a sample sequence
-	values = generate_values_sequence(is_cmd_word=True, data=0x1234)
-	delays = generate_delays_sequence()
+	data   = 0x1234
+	values = generate_values_sequence(is_cmd_word=True, data=data)
 
 
-	# Create clock - runs independently
-	clock = Clock(dut.i_clk, 10, "ns")  # 100 MHz
-	clock.start(start_high=False)
-	await RisingEdge(dut.i_clk)
+	# Sync to clock
+	await _prolog(dut)
      
 	# Reset and initialize
 	await reset_dut(dut)
-	await init_dut(dut)
+	init_dut(dut)
 	dut.i_en.value = 1
-     
-	writer_task = cocotb.start_soon(send_signals(dut, values, delays))
-     
-	for i in range(len(values) * 50 + 100):  # Wait enough cycles
-		await RisingEdge(dut.i_clk)
-        
-		# Check for completion
-		await ReadOnly()
-		if dut.o_data_valid.value == 1:
-			dut._log.info(f"Output valid detected at cycle {i}")
-			break
-          
-		await NextTimeStep()
-        
-		if i % 100 == 0:
-			print_dut_state(dut)
-    
-    # Wait for writer to complete
-	await writer_task
+
+	# The test bench top plays the chips back on its own
+	await load_rom(dut, values)
+
+	# Single wait for the result. o_data_valid rises in DONE, right after the last chip,
+	# so the timeout is the playback time of the word plus a 10 chip margin for decode latency.
+	# A receiver failure ends the wait straight away instead of running out the timeout
+	data_valid = RisingEdge(dut.o_data_valid)
+	fail       = RisingEdge(dut.o_fail_flag)
+	result = await First(data_valid, fail, Timer((len(values) + 10) * BASE_DUR_NS, "ns"))
+	await ReadOnly()
+	print_dut_state(dut)
+	assert result is not fail, "Receiver entered the fail state"
+	assert result is data_valid, "Timed out waiting for o_data_valid"
+	dut._log.info("Output valid detected")
+
+	# Check the decoded word
+	assert dut.o_fail_flag.value == 0, "o_fail_flag set alongside o_data_valid"
+	assert int(dut.o_word_type.value) == COMMAND_WORD, f"Expected a command word, got word type {dut.o_word_type.value}"
+	assert int(dut.o_data_word.value) == data, \
+		f"Received data word 0x{int(dut.o_data_word.value):04X} does not match expected 0x{data:04X}"
 
 
 
@@ -250,10 +233,15 @@ def test_reciever_runner():
     proj_path = "/home/cody/workspace/mil_adapter"
     print(f"Project Path: {proj_path}")
     
-    # Enable waveform tracing
-    os.environ["TRACES"] = "1"
+    # Waveform tracing is off by default. Enable per run with WAVES=1
+    trace = os.environ.get("WAVES", "0") == "1"
+    rebuild = os.environ.get("REBUILD", "0") == "1"
+    if trace:
+        os.environ["TRACES"] = "1"
     os.environ["COCOTB_LOG_LEVEL"] = "INFO"
     
+    hdl_toplevel = "reciever_tb_top"
+
     runner = get_runner(sim)
     runner.build(
         sources=[
@@ -265,12 +253,16 @@ def test_reciever_runner():
             f"{proj_path}/src/mylib/edge_detector.sv",
             f"{proj_path}/src/mylib/window_filter.sv",
             f"{proj_path}/src/mylib/reciever.sv",
+            f"{proj_path}/src/mylib/test/reciever_tb_top.sv",
         ],
-        hdl_toplevel="reciever",
-        always=True,
+        hdl_toplevel=hdl_toplevel,
+        build_dir=f"sim_build/{hdl_toplevel}",   # Per-DUT build so runners can run in parallel
+        clean=rebuild,                            # REBUILD=1 wipes build_dir first
+        timescale=("1ns", "1ps"),                 # Default for every module; none of the sources declare one
+        waves=trace,
         build_args=[
-            "--trace-fst",
-            "--trace-structs",
+            "--timing",
+            *(["--trace-fst", "--trace-structs"] if trace else []),
             # "--trace-depth", "99",
             # "--assert",              # Enable assertions
             # "-Wall",
@@ -279,16 +271,19 @@ def test_reciever_runner():
             # "+define+VERILATOR",
         ],
         parameters={
-            "MasterClockFreq_Hz": 100_000_000,  # 100 MHz
-            "BitRate_Hz": 1_000_000,            # 1 MHz
-            "EnableWindowFilter": 1,             # Enable timing window initially
+            "MASTER_CLK_FREQ_HZ": 100_000_000,  # 100 MHz
+            "MAN_BIT_RATE_HZ": 1_000_000,       # 1 MHz
+            "EN_WINDOW_FILTER": 1,              # Enable timing window initially
             "DUR_AFTER_LAST_CHIP_NS": 1000,     # 1000 ns
-            "EN_COUNT_RESET_ON_CHIP_END": 0     # Disable count reset on chip end
+            "EN_COUNT_RESET_ON_CHIP_END": 0,    # Disable count reset on chip end
+            "BASE_DUR_NS": BASE_DUR_NS,         # Stimulus ROM chip duration
+            "CLK_PERIOD_NS": CLK_PERIOD_NS,     # Stimulus ROM clock period
         }
     )
     
     runner.test(
-        hdl_toplevel="reciever",
+        hdl_toplevel=hdl_toplevel,
+        waves=trace,
         test_module="tbc_reciever",
     )
 
@@ -1,11 +1,18 @@
 import cocotb
-from cocotb.clock import Clock
-from cocotb.triggers import FallingEdge, NextTimeStep, ReadOnly, RisingEdge, Timer
+from cocotb.handle import Immediate
+from cocotb.triggers import FallingEdge, First, NextTimeStep, ReadOnly, RisingEdge, Timer
+from cocotb.types import Logic
 from cocotb_tools.runner import get_runner
+import logging
 import os
 from test_tools import * 
 
 
+# Pre-built chip values, reused for every write to i_rx_in
+ZERO = Logic(0)
+ONE  = Logic(1)
+
+
 
 
 
@@ -40,6 +47,15 @@ class RecieverDataTestSignal:
 			self.data_bits = data_bits
 		else:
 			raise ValueError("data_bits must be either int or list[int]")
+
+		# Parity of the data bits alone, from a popcount of the packed word
+		self._data_int = msb_bit_list_2_int(self.data_bits)
+		self._parity   = bin(self._data_int).count("1") & 1
+
+		# Full chip array (pre bit + data bits + parity) is built once and sliced per call.
+		# The symbol needs exactly 15 data bits, so it is only packed on first use
+		self._chips  = self._encode_chips()
+		self._symbol = None
 	
 	def __str__(self):
 		return f"RecieverDataTestSignal(name={self.name}, pre_data_bit={self.pre_data_bit}, data_bits={self.data_bits})"
@@ -55,53 +71,44 @@ class RecieverDataTestSignal:
 		return self.data_bits
 	
 
-	def get_data_chips(self, append_pre_bit = True, append_parity = True) -> list[int]:
-		"""Generate Manchester encoded chips for the data bits"""
-		pre_bit_chips = []
-		chip_array    = []
-		parity_bits   = []
-		temp_odd_parity = 0
-
-		pre_bit_chips = generate_manchester_chip(self.pre_data_bit)
+	def _encode_chips(self) -> list[int]:
+		"""Generate Manchester encoded chips for the pre bit, data bits and parity"""
+		chip_array = list(generate_manchester_chip(self.pre_data_bit))
 
 		for bit in self.data_bits:
 			chip_array += generate_manchester_chip(bit)
-			temp_odd_parity ^= bit
 
-		parity_bits = generate_manchester_chip(temp_odd_parity)
+		chip_array += generate_manchester_chip(self._parity)
+		return chip_array
 
-		result = []
-		if append_pre_bit:
-			result += pre_bit_chips
-		result += chip_array
-		if append_parity:
-			result += parity_bits
-		return result
+
+	def _encode_symbol(self) -> int:
+		"""Pack the pre bit, data bits and parity into an unsigned integer (MSB first)"""
+		if len(self.data_bits) != 15:
+			raise ValueError(f"Final length mismatch in to_symbol_integer {15 - len(self.data_bits)}")
+
+		parity = self.pre_data_bit ^ self._parity	# always include pre bit in parity
+
+		# Pre bit, one zero bit, data bits, parity
+		return (self.pre_data_bit << 17) | (self._data_int << 1) | parity
+
+
+	def get_data_chips(self, append_pre_bit = True, append_parity = True) -> list[int]:
+		"""Generate Manchester encoded chips for the data bits"""
+		start = 0 if append_pre_bit else 2
+		end   = len(self._chips) if append_parity else len(self._chips) - 2
+		return self._chips[start:end]
 	
 
 	def to_symbol_integer(self, append_pre_bit = True, append_parity = True) -> int:
 		"""Convert the full chip array to an unsigned integer"""
-		final_len = 15 + (1 if append_pre_bit else 0) + (1 if append_parity else 0)
-		result = 0
-		if append_pre_bit:
-			result = self.pre_data_bit
-			result <<= 1
-			final_len -= 1
-
-		for bit in self.data_bits:
-			result = (result << 1) | bit
-			final_len -= 1
-
-		if append_parity:
-			temp_odd_parity = self.pre_data_bit # always include pre bit in parity
-			for bit in self.data_bits:
-				temp_odd_parity ^= bit
-			result = (result << 1) | temp_odd_parity
-			final_len -= 1
-		
-		if final_len != 0:
-			raise ValueError(f"Final length mismatch in to_symbol_integer {final_len}")
-		
+		if self._symbol is None:
+			self._symbol = self._encode_symbol()
+		result = self._symbol
+		if not append_pre_bit:
+			result &= (1 << (len(self.data_bits) + 1)) - 1
+		if not append_parity:
+			result >>= 1
 		return result
 
 
@@ -111,77 +118,77 @@ class RecieverDataTestSignal:
 
 
 
-async def reset_dut(dut):
-	"""Reset the DUT"""
-	dut.i_reset.value = 1
+async def _prolog(dut):
+	"""Sync to the clock generated by the test bench top"""
 	await RisingEdge(dut.i_clk)
+
+
+async def reset_dut(dut):
+	"""Reset the DUT with a single clock of i_reset"""
+	dut.i_reset.value = Immediate(1)
 	await RisingEdge(dut.i_clk)
 	dut.i_reset.value = 0
-	await RisingEdge(dut.i_clk)
-	await RisingEdge(dut.i_clk)
      
 
-async def init_dut(dut):
-	"""Initialize the DUT"""
-	dut.i_rx_in.value = 0
-	dut.i_rx_valid.value = 0
-	dut.i_clear.value = 0
-	dut.i_pre_data_bit.value = 0
-	await RisingEdge(dut.i_clk)
-	await RisingEdge(dut.i_clk)
+def init_dut(dut):
+	"""Initialize the DUT inputs before the next clock edge"""
+	dut.i_rx_in.value = Immediate(ZERO)
+	dut.i_rx_valid.value = Immediate(0)
+	dut.i_clear.value = Immediate(0)
+	dut.i_pre_data_bit.value = Immediate(0)
     
 
 def print_dut_state(dut):
 	"""Print the internal state of the DUT for debugging"""
-	state     = dut.current_state.value.to_unsigned()
-	bit_idx   = dut.bit_idx.value.to_unsigned()
-	chip_idx  = dut.chip_idx.value
-	data_word = dut.o_data_word.value.to_unsigned()
-	fail      = dut.o_fail.value
-      
-	debug(f"DUT State: state={state}, bit_idx={bit_idx}, chip_idx={chip_idx}, data_word={data_word:b}, fail={fail}")
+	if not dut._log.isEnabledFor(logging.DEBUG):
+		return
+
+	uut = dut.reciever_data_uut
+	dut._log.debug("DUT State: state=%d, bit_idx=%d, chip_idx=%s, data_word=%s, fail=%s",
+				int(uut.current_state.value), int(uut.bit_idx.value), uut.chip_idx.value,
+				dut.o_data_word.value, dut.o_fail.value)
+
+
+async def _drive_chip(clk, rx_in, rx_valid, chip):
+	"""Present a single chip to the DUT for one clock, then idle for one clock
+
+	Takes the signal handles rather than dut so callers can bind them once before the chip loop
+	"""
+	rx_in.value = ONE if chip else ZERO
+	rx_valid.value = 1
+	await RisingEdge(clk)
+	rx_valid.value = 0
+	await RisingEdge(clk)
+
+
+async def wait_done_or_fail(dut):
+	"""Wait until the DUT signals either done or fail"""
+	await First(RisingEdge(dut.o_done), RisingEdge(dut.o_fail))
+
+
+async def wait_fail(dut):
+	"""Wait until the DUT signals fail"""
+	await RisingEdge(dut.o_fail)
 
 
 async def enumerate_through_list(dut, lst : list[int], expect_fail=False) -> bool:
 
 	recorded_fail = False
+	clk, rx_in, rx_valid = dut.i_clk, dut.i_rx_in, dut.i_rx_valid
+	done_task = cocotb.start_soon(wait_done_or_fail(dut))
 
 	for i, chip in enumerate(lst):	# Exclude pre bit, include parity
 
-		if dut.o_done.value == 1:
+		if done_task.done():
 			debug(f"DUT signalled done early on index : {i}")
 			recorded_fail = True
 			break
-			
-		if local_chip_idx == 0:  
-			dut.i_rx_in.value = chip
-			dut.i_rx_valid.value = 1
-			await RisingEdge(dut.i_clk)
-			dut.i_rx_valid.value = 0
-			await RisingEdge(dut.i_clk)
-
-			await ReadOnly()
-			print_dut_state(dut)
-			# assert dut.chip_idx.value == 1, f"Chip 0 index mismatch at chip {i}"
-			await NextTimeStep()
-				
-			local_chip_idx = 1
 
-		else:
+		await _drive_chip(clk, rx_in, rx_valid, chip)
 
-			dut.i_rx_in.value = chip
-			dut.i_rx_valid.value = 1
-			await RisingEdge(dut.i_clk)
-			dut.i_rx_valid.value = 0
-			await RisingEdge(dut.i_clk)
+	if not done_task.done():
+		done_task.cancel()
 
-			await ReadOnly()
-			print_dut_state(dut)
-			# assert dut.chip_idx.value == 0, f"Chip 1 index mismatch at chip {i}"
-			await NextTimeStep()
-
-			local_chip_idx = 0
-	
 	return recorded_fail == expect_fail
 
 
@@ -189,15 +196,16 @@ async def enumerate_through_list(dut, lst : list[int], expect_fail=False) -> boo
 @cocotb.test()
 async def test_reciever_valid_data(dut):
 	"""Test reciever_data with valid data word"""
+
+	# Bind signal handles once
+	clk, rx_in, rx_valid = dut.i_clk, dut.i_rx_in, dut.i_rx_valid
       
-	# Create a clock
-	clock = Clock(dut.i_clk, 10, "ns")  # 10 ns period
-	clock.start(start_high=False)
-	await RisingEdge(dut.i_clk)
+	# Sync to clock
+	await _prolog(dut)
 
 	# Reset and initialize DUT
 	await reset_dut(dut)
-	await init_dut(dut)
+	init_dut(dut)
 
 	test_signal = RecieverDataTestSignal(name="Valid Data Word Test",
 										pre_data_bit = 0,
@@ -208,8 +216,8 @@ async def test_reciever_valid_data(dut):
 	dut.i_pre_data_bit.value = test_signal.get_pre_data_bit()
     
 	# Store the pre bit
-	dut.i_rx_valid.value = 1
-	await RisingEdge(dut.i_clk)
+	rx_valid.value = 1
+	await RisingEdge(clk)
       
 	# Make sure the pre bit is registered
 	await ReadOnly()
@@ -219,47 +227,25 @@ async def test_reciever_valid_data(dut):
 	await NextTimeStep()
     
 	# Stop valid signal before sending chips
-	dut.i_rx_valid.value = 0
-	await RisingEdge(dut.i_clk)
-	await RisingEdge(dut.i_clk)
-      
-	local_chip_idx = 1	# Required to sync with DUT chip index
+	rx_valid.value = 0
+	await RisingEdge(clk)
+	await RisingEdge(clk)
       
+	done_task = cocotb.start_soon(wait_done_or_fail(dut))
+
 	# Feed in chips
 	for i, chip in enumerate(test_signal.get_data_chips(False, True)):	# Exclude pre bit, include parity
 
-		if dut.o_done.value == 1:
+		if done_task.done():
 			debug(f"DUT signalled done early on index : {i}")
 			break
-            
-		if local_chip_idx == 0:  
-			dut.i_rx_in.value = chip
-			dut.i_rx_valid.value = 1
-			await RisingEdge(dut.i_clk)
-			dut.i_rx_valid.value = 0
-			await RisingEdge(dut.i_clk)
-
-			await ReadOnly()
-			print_dut_state(dut)
-			# assert dut.chip_idx.value == 1, f"Chip 0 index mismatch at chip {i}"
-			await NextTimeStep()
-                
-			local_chip_idx = 1
-    
-		else:
 
-			dut.i_rx_in.value = chip
-			dut.i_rx_valid.value = 1
-			await RisingEdge(dut.i_clk)
-			dut.i_rx_valid.value = 0
-			await RisingEdge(dut.i_clk)
+		await _drive_chip(clk, rx_in, rx_valid, chip)
 
-			await ReadOnly()
-			print_dut_state(dut)
-			# assert dut.chip_idx.value == 0, f"Chip 1 index mismatch at chip {i}"
-			await NextTimeStep()
-
-			local_chip_idx = 0
+	if done_task.done():
+		print_dut_state(dut)
+	else:
+		done_task.cancel()
 
 	rx_data_int = dut.o_data_word.value.to_unsigned()
 	
@@ -281,15 +267,16 @@ async def test_reciever_valid_data(dut):
 async def test_reciever_reject_invalid_manchester_encoding(dut):
 
 	"""Test reciever_data with invalid Manchester encoding"""
+
+	# Bind signal handles once
+	clk, rx_in, rx_valid = dut.i_clk, dut.i_rx_in, dut.i_rx_valid
 	  
-	# Create a clock
-	clock = Clock(dut.i_clk, 10, "ns")  # 10 ns period
-	clock.start(start_high=False)
-	await RisingEdge(dut.i_clk)
+	# Sync to clock
+	await _prolog(dut)
 
 	# Reset and initialize DUT
 	await reset_dut(dut)
-	await init_dut(dut)
+	init_dut(dut)
 
 	test_signal = RecieverDataTestSignal(name="Invalid Manchester Encoding Test",
 										pre_data_bit = 1,
@@ -300,8 +287,8 @@ async def test_reciever_reject_invalid_manchester_encoding(dut):
 	dut.i_pre_data_bit.value = test_signal.get_pre_data_bit()
 	
 	# Store the pre bit
-	dut.i_rx_valid.value = 1
-	await RisingEdge(dut.i_clk)
+	rx_valid.value = 1
+	await RisingEdge(clk)
 	  
 	# Make sure the pre bit is registered
 	await ReadOnly()
@@ -311,12 +298,10 @@ async def test_reciever_reject_invalid_manchester_encoding(dut):
 	await NextTimeStep()
 	
 	# Stop valid signal before sending chips
-	dut.i_rx_valid.value = 0
-	await RisingEdge(dut.i_clk)
-	await RisingEdge(dut.i_clk)
+	rx_valid.value = 0
+	await RisingEdge(clk)
+	await RisingEdge(clk)
 	  
-	local_chip_idx = 1	# Required to sync with DUT chip index
-
 	# Introduce an error in the Manchester encoding
 	invalid_chips = test_signal.get_data_chips(False, True)  # Exclude pre bit, include parity
 	
@@ -327,42 +312,22 @@ async def test_reciever_reject_invalid_manchester_encoding(dut):
 	debug(f"Invalid Chips: {invalid_chips}")
 
 	failure_recorded = False
+	fail_task = cocotb.start_soon(wait_fail(dut))
 
 	# Feed in chips
 	for i, chip in enumerate(invalid_chips):	# Exclude pre bit and parity
 
-		if dut.o_fail.value == 1:
+		if fail_task.done():
 			debug(f"DUT signalled fail as expected on index : {i}")
 			failure_recorded = True
 			break
-			
-		if local_chip_idx == 0:  
-			dut.i_rx_in.value = chip
-			dut.i_rx_valid.value = 1
-			await RisingEdge(dut.i_clk)
-			dut.i_rx_valid.value = 0
-			await RisingEdge(dut.i_clk)
-
-			await ReadOnly()
-			print_dut_state(dut)
-			await NextTimeStep()
-				
-			local_chip_idx = 1
-	
-		else:
-
-			dut.i_rx_in.value = chip
-			dut.i_rx_valid.value = 1
-			await RisingEdge(dut.i_clk)
-			dut.i_rx_valid.value = 0
-			await RisingEdge(dut.i_clk)
 
-			await ReadOnly()
-			print_dut_state(dut)
-			# assert dut.chip_idx.value == 0, f"Chip 1 index mismatch at chip {i}"
-			await NextTimeStep()
+		await _drive_chip(clk, rx_in, rx_valid, chip)
 
-			local_chip_idx = 0
+	if fail_task.done():
+		failure_recorded = True
+	else:
+		fail_task.cancel()
 
 	assert failure_recorded == True, "DUT did not detect invalid Manchester encoding"
 
@@ -373,19 +338,34 @@ def test_reciever_data_runner():
     proj_path = "/home/cody/workspace/mil_adapter"
     print(f"Project Path: {proj_path}")
     
-    # Enable waveform tracing
-    os.environ["TRACES"] = "1"
+    # Waveform tracing is off by default. Enable per run with WAVES=1
+    trace = os.environ.get("WAVES", "0") == "1"
+    rebuild = os.environ.get("REBUILD", "0") == "1"
+    if trace:
+        os.environ["TRACES"] = "1"
+    # DUT state dumps need COCOTB_LOG_LEVEL=DEBUG; use WARNING for quiet perf runs
+    os.environ.setdefault("COCOTB_LOG_LEVEL", "INFO")
     
+    hdl_toplevel = "top_reciever_data"
+
     runner = get_runner(sim)
     runner.build(
-        sources=[f"{proj_path}/src/mylib/reciever_data.sv"],
-        hdl_toplevel="reciever_data",
-        always=True,
-        build_args=["--trace-fst", "--trace-structs"]
+        sources=[
+            f"{proj_path}/src/mylib/lib_1553.sv",
+            f"{proj_path}/src/mylib/reciever_data.sv",
+            f"{proj_path}/src/mylib/test/top_reciever_data.sv",
+        ],
+        hdl_toplevel=hdl_toplevel,
+        build_dir=f"sim_build/{hdl_toplevel}",   # Per-DUT build so runners can run in parallel
+        clean=rebuild,                            # REBUILD=1 wipes build_dir first
+        timescale=("1ns", "1ps"),                 # Default for every module; none of the sources declare one
+        waves=trace,
+        build_args=["--timing"] + (["--trace-fst", "--trace-structs"] if trace else [])
     )
     
     runner.test(
-        hdl_toplevel="reciever_data",
+        hdl_toplevel=hdl_toplevel,
+        waves=trace,
         test_module="tbc_reciever_data",
     )
 
@@ -1,8 +1,12 @@
+import array
 import cocotb
-from cocotb.clock import Clock
 from cocotb.triggers import FallingEdge, NextTimeStep, ReadOnly, RisingEdge, Timer
+from cocotb.types import Logic
 from cocotb_tools.runner import get_runner
+from functools import lru_cache
 import os
+import sys
+from test_tools import ENABLE_VERBOSE_LOGGING, _SYNC_CMD, _SYNC_DATA, msb_bit_list_2_int
 
 
 
@@ -11,77 +15,120 @@ DATA_WORD    = 1
 
 EXPECTED_IDX = 7    
 
+# Pre-built chip values, reused for every write to i_rx_in
+ZERO = Logic(0)
+ONE  = Logic(1)
 
+# Every even bit of a 64-bit word, used as the low chip of each Manchester pair
+_EVEN_BITS = 0x5555555555555555
 
+# Maps the ASCII digits of a binary string straight to chip values 0/1
+_ASCII_TO_CHIP = bytes.maketrans(b"01", b"\x00\x01")
 
-def generate_sync_pattern(is_command_word):
-    """Generate sync pattern for command or data word"""
-    if is_command_word:
-        return [1, 1, 1, 0, 0, 0]  # Command Word Sync
-    else:
-        return [1, 0, 1, 0, 0, 1]  # Data Word Sync
 
 
-def generate_manchester_chip(bit):
-    """Generate Manchester encoded chip for a given bit (0 or 1)
-       From t=0 point of view, the first half of the bit period is the first element"""
-    if bit == 1:
-        return [1, 0]  # '1' -> High to Low
-    else:
-        return [0, 1]  # '0' -> Low to High
 
+def _spread_bits(value):
+    """Move bit i of a 32-bit value to bit 2i (interleave with zeros)"""
+    value = (value | (value << 16)) & 0x0000FFFF0000FFFF
+    value = (value | (value << 8))  & 0x00FF00FF00FF00FF
+    value = (value | (value << 4))  & 0x0F0F0F0F0F0F0F0F
+    value = (value | (value << 2))  & 0x3333333333333333
+    value = (value | (value << 1))  & _EVEN_BITS
+    return value
 
-def generate_manchester_word(sync_type, data_bits):
-    """Generate Manchester encoded word with specified sync and first data bit"""
-    sync_bits   = []
-    chip_array  = []
-    parity_bits = []
+
+def manchester_encode_int(value, bit_length):
+    """Manchester encode the low bit_length bits of value (MSB first) into a 2*bit_length chip integer
+       Each bit b becomes the chip pair (b, ~b), i.e. '1' -> 10 and '0' -> 01"""
+    chips = 0
+    # Whole words are 16 data bits, so this runs once. Longer inputs go 32 bits at a time
+    for start in range(0, bit_length, 32):
+        width  = min(32, bit_length - start)
+        chunk  = (value >> (bit_length - start - width)) & ((1 << width) - 1)
+        spread = _spread_bits(chunk)
+        chips  = (chips << (2 * width)) | (spread << 1) | (spread ^ (_EVEN_BITS & ((1 << (2 * width)) - 1)))
+    return chips
+
+
+@lru_cache(maxsize=256)
+def _generate_manchester_word(sync_type, data_bits):
+    """Build the chips (one byte each) for a sync type and a tuple of data bits"""
     if sync_type == COMMAND_WORD:
-        sync_bits += [1, 1, 1, 0, 0, 0]  # Command Word Sync
+        sync_bits = _SYNC_CMD
     elif sync_type == DATA_WORD:
-        sync_bits += [0, 0, 0, 1, 1, 1]  # Data Word Sync
+        sync_bits = _SYNC_DATA
     else:
         raise ValueError("Invalid sync_type. Use 'command' or 'data'.")
-    temp_odd_parity = 0
-    for bit in data_bits:
-        chip_array += generate_manchester_chip(bit)
-        temp_odd_parity ^= bit
-    parity_bits = generate_manchester_chip(temp_odd_parity)
+    # Sync, data chips and parity chips are assembled as one integer and unpacked once
+    data_len  = len(data_bits)
+    data_int  = msb_bit_list_2_int(data_bits)
+    temp_odd_parity = data_int.bit_count() & 1
+    total_int = msb_bit_list_2_int(sync_bits)
+    total_int = (total_int << (2 * data_len)) | manchester_encode_int(data_int, data_len)
+    total_int = (total_int << 2) | manchester_encode_int(temp_odd_parity, 1)
+
+    # Format once and translate the digits in place of building an intermediate list of ints
+    total_len = len(sync_bits) + 2 * data_len + 2
+    return f"{total_int:0{total_len}b}".encode("ascii").translate(_ASCII_TO_CHIP)
+
 
+def print_manchester_word(sync_type, data_bits, total):
+    """Print the parts of a generated Manchester word"""
     print(f"Generated from {sync_type} word: {data_bits}")
-    print(f"  Sync bits: {sync_bits}")
+    print(f"  Sync bits: {list(total[:6])}")
     print(f"  Data bits: {data_bits}")
-    print(f"  Chip array: {chip_array}")
-    print(f"  Parity bits: {temp_odd_parity} := {parity_bits}")
+    print(f"  Chip array: {list(total[6:-2])}")
+    print(f"  Parity bits: {total[-2]} := {list(total[-2:])}")
+    print(f"Expected Prefix Pattern : {list(total[0:6+2])}")
 
-    total = sync_bits + chip_array + parity_bits
-    total_len = len(total)
-    prefix = total[0:6+2]
-    print(f"Expected Prefix Pattern : {prefix}")
 
-    return total
+def generate_manchester_word(sync_type, data_bits):
+    """Generate Manchester encoded word with specified sync and first data bit
+       Words are cached per (sync_type, data_bits). A fresh array('b') is returned so tests can modify it"""
+    total = _generate_manchester_word(sync_type, tuple(data_bits))
 
+    if ENABLE_VERBOSE_LOGGING:
+        print_manchester_word(sync_type, data_bits, total)
 
+    return array.array('b', total)
 
-def print_bit_buffer(dut, enum_idx):
-    """Helper function to print bit buffer as string"""
-    # Get uint value
-    uns_int = dut.buffer.value.to_unsigned()
-    # Convert to binary string
-    bin_str = f"{uns_int:b}"
-    idx_cur = dut.idx.value.to_unsigned()
 
-    print(f"[Buffer] idx_cur={idx_cur} | enum={enum_idx} | buffer={bin_str}")
 
-    if dut.o_done.value == 1:
-        print(f"[Buffer] >>>>> DONE asserted {dut.o_word_type.value} <<<<<")
-        if dut.o_word_type.value == COMMAND_WORD:
-            print(f"[Buffer] Command Word Received | Data Bit={dut.o_data_bit.value}")
+@lru_cache(maxsize=None)
+def _bit_buffer_handles(dut):
+    """Handles read by print_bit_buffer, resolved once per DUT"""
+    uut = dut.reciever_prefix_uut
+    return uut.buffer, uut.idx, dut.o_done, dut.o_fail, dut.o_word_type, dut.o_data_bit
+
+
+def print_bit_buffer(dut, enum_idx, log, done=None, fail=None):
+    """Append the bit buffer state to log as text
+       done/fail can be passed in when the caller already read them this cycle"""
+    if not ENABLE_VERBOSE_LOGGING:
+        return
+
+    buffer, idx, o_done, o_fail, o_word_type, o_data_bit = _bit_buffer_handles(dut)
+    # Get uint value
+    uns_int = buffer.value.to_unsigned()
+    idx_cur = idx.value.to_unsigned()
+    if done is None:
+        done = o_done.value == 1
+    if fail is None:
+        fail = o_fail.value == 1
+
+    log.append(f"[Buffer] idx_cur={idx_cur} | enum={enum_idx} | buffer={uns_int:b}")
+
+    if done:
+        word_type = o_word_type.value
+        log.append(f"[Buffer] >>>>> DONE asserted {word_type} <<<<<")
+        if word_type == COMMAND_WORD:
+            log.append(f"[Buffer] Command Word Received | Data Bit={o_data_bit.value}")
         else:
-            print(f"[Buffer] Data Word Received | Data Bit={dut.o_data_bit.value}")
+            log.append(f"[Buffer] Data Word Received | Data Bit={o_data_bit.value}")
 
-    if dut.o_fail.value == 1:
-        print(f"[Buffer] >>>>> FAIL asserted <<<<<")
+    if fail:
+        log.append(f"[Buffer] >>>>> FAIL asserted <<<<<")
 
 
 
@@ -89,9 +136,7 @@ def print_bit_buffer(dut, enum_idx):
 async def perform_test(dut, chip_array, expected_done_idx, expected_word_type, expected_data_bit, expect_to_fail):
     """Perform test by feeding in chips and checking outputs"""
 
-    # Start clock
-    clock = Clock(dut.i_clk, 10, "ns")
-    clock.start(start_high=False)
+    # Sync to clock
     await RisingEdge(dut.i_clk)
 
     # Initialize inputs
@@ -111,42 +156,63 @@ async def perform_test(dut, chip_array, expected_done_idx, expected_word_type, e
 
     # Tell DUT to start receiving
     dut.i_rx_valid.value = 1
-    dut.i_rx_in.value    = chip_array[len(chip_array)-1]
+    dut.i_rx_in.value    = chip_array[-1]
+
+    # Buffer trace is collected per cycle and written once at the end of the test
+    log  = [] if ENABLE_VERBOSE_LOGGING else None
+    note = print if log is None else log.append
 
     # Initial buffer print
-    print_bit_buffer(dut, -1)
+    print_bit_buffer(dut, -1, log)
     
-    # Feed in chips
-    for i, chip in enumerate(chip_array):
-        # Set input chip
-        dut.i_rx_in.value = chip
-        # Wait for clock edge
-        await RisingEdge(dut.i_clk)
-        # Read-only phase to capture outputs
-        await ReadOnly()
-        print_bit_buffer(dut, i)
-        # Resume step based clock cycles
-
-        # Check for fail signal
-        if dut.o_fail.value == 1:
-            print(f"[Test] o_fail asserted at chip index {i}")
-            print(f"o_fail   : {dut.o_fail.value}")
-            print_bit_buffer(dut, i)
-            assert expect_to_fail == True, f"[Test] Unexpected o_fail at index {i}"
-            # If we expected a fail, we can exit early
-            break
-
-        # Check for done signal
-        if dut.o_done.value == 1:
-            print(f"[Test] o_done asserted at chip index {i}")
-            assert i == expected_done_idx, f"[Test] Expected o_done at index {expected_done_idx}, got {i}"
-            assert dut.o_word_type.value == expected_word_type, f"[Test] Expected word type {expected_word_type}, got {dut.o_word_type.value}"
-            assert dut.o_data_bit.value == expected_data_bit, f"[Test] Expected data bit {expected_data_bit}, got {dut.o_data_bit.value}"
-            break
-        await NextTimeStep()
+    # Triggers and signal handles are bound once and reused on every chip
+    rise = RisingEdge(dut.i_clk)
+    ro   = ReadOnly()
+    rx_in, o_done, o_fail = dut.i_rx_in, dut.o_done, dut.o_fail
+    o_word_type, o_data_bit = dut.o_word_type, dut.o_data_bit
+
+    try:
+        # Feed in chips. Each chip is set right after the edge that samples the previous one,
+        # so the loop goes from ReadOnly straight to the next edge without a NextTimeStep
+        last_idx = len(chip_array) - 1
+        rx_in.value = ONE if chip_array[0] else ZERO
+        for i in range(len(chip_array)):
+            # Wait for clock edge
+            await rise
+            # Set next input chip
+            if i < last_idx:
+                rx_in.value = ONE if chip_array[i + 1] else ZERO
+            # Read-only phase to capture outputs
+            await ro
+            # Read the outputs once per cycle
+            done = o_done.value == 1
+            fail = o_fail.value == 1
+            print_bit_buffer(dut, i, log, done, fail)
+
+            # Check for fail signal
+            if fail:
+                note(f"[Test] o_fail asserted at chip index {i}")
+                assert expect_to_fail == True, f"[Test] Unexpected o_fail at index {i}"
+                # If we expected a fail, we can exit early
+                break
+
+            # Check for done signal
+            if done:
+                note(f"[Test] o_done asserted at chip index {i}")
+                word_type = o_word_type.value
+                data_bit  = o_data_bit.value
+                assert i == expected_done_idx, f"[Test] Expected o_done at index {expected_done_idx}, got {i}"
+                assert word_type == expected_word_type, f"[Test] Expected word type {expected_word_type}, got {word_type}"
+                assert data_bit == expected_data_bit, f"[Test] Expected data bit {expected_data_bit}, got {data_bit}"
+                break
+    finally:
+        # Single write of the trace, also when an assert above fails
+        if log:
+            sys.stdout.write("\n".join(log) + "\n")
+
     # Check if we missed a failure
     if expect_to_fail:
-        assert dut.o_fail.value == 1, "[Test] Expected o_fail but it was not asserted"
+        assert o_fail.value == 1, "[Test] Expected o_fail but it was not asserted"
 
 
 @cocotb.test()
@@ -194,7 +260,7 @@ async def test_invalid_sync_rejection(dut):
     chip_array = generate_manchester_word(test_type, data_bits)
 
     # Introduce an error in the sync pattern
-    chip_array[2] = not chip_array[2]  # Flip a bit in the sync pattern
+    chip_array[2] ^= 1  # Flip a bit in the sync pattern
 
     await perform_test(dut, chip_array,
                 expected_done_idx = 7,
@@ -248,31 +314,81 @@ async def test_invalid_data_word_data_rejection(dut):
 
 
 
-def test_reciever_prefix_runner():
-    """Runner function for pytest"""
+def reciever_prefix_build():
+    """Build the model once, shared by every testcase"""
     sim = "verilator"
     proj_path = "/home/cody/workspace/mil_adapter"
     print(f"Project Path: {proj_path}")
     
-    # Enable waveform tracing
-    os.environ["TRACES"] = "1"
+    # Waveform tracing is off by default. Enable per run with WAVES=1
+    trace = os.environ.get("WAVES", "0") == "1"
+    rebuild = os.environ.get("REBUILD", "0") == "1"
+    if trace:
+        os.environ["TRACES"] = "1"
     
+    hdl_toplevel = "top_reciever_prefix"
+
     runner = get_runner(sim)
     runner.build(
         sources=[
             f"{proj_path}/src/mylib/reciever_prefix.sv",
+            f"{proj_path}/src/mylib/test/top_reciever_prefix.sv",
             # Add any dependencies here
         ],
-        hdl_toplevel="reciever_prefix",
-        always=True,
-        build_args=["--trace-fst", "--trace-structs"]
+        hdl_toplevel=hdl_toplevel,
+        build_dir=f"sim_build/{hdl_toplevel}",   # One build per DUT, shared by every testcase
+        clean=rebuild,                            # REBUILD=1 wipes build_dir first
+        timescale=("1ns", "1ps"),                 # Default for every module; none of the sources declare one
+        waves=trace,
+        build_args=["--timing"] + (["--trace-fst", "--trace-structs"] if trace else [])
     )
+
+
+def reciever_prefix_runner(testcase=None):
+    """Run one testcase, or the whole module, against the built model"""
+    # Waveform tracing is off by default. Enable per run with WAVES=1
+    trace = os.environ.get("WAVES", "0") == "1"
+    if trace:
+        os.environ["TRACES"] = "1"
     
+    hdl_toplevel = "top_reciever_prefix"
+
+    runner = get_runner("verilator")
     runner.test(
-        hdl_toplevel="reciever_prefix",
+        hdl_toplevel=hdl_toplevel,
+        build_dir=f"sim_build/{hdl_toplevel}",
+        test_dir=f"sim_build/{hdl_toplevel}/{testcase or 'all'}",
+        waves=trace,
         test_module="tbc_reciever_prefix",
+        testcase=testcase,
     )
 
 
+def test_valid_command_word_reception_runner(reciever_prefix_model):
+    """Runner for test_valid_command_word_reception"""
+    reciever_prefix_runner("test_valid_command_word_reception")
+
+
+def test_valid_data_word_reception_runner(reciever_prefix_model):
+    """Runner for test_valid_data_word_reception"""
+    reciever_prefix_runner("test_valid_data_word_reception")
+
+
+def test_invalid_sync_rejection_runner(reciever_prefix_model):
+    """Runner for test_invalid_sync_rejection"""
+    reciever_prefix_runner("test_invalid_sync_rejection")
+
+
+def test_invalid_cmd_word_data_rejection_runner(reciever_prefix_model):
+    """Runner for test_invalid_cmd_word_data_rejection"""
+    reciever_prefix_runner("test_invalid_cmd_word_data_rejection")
+
+
+def test_invalid_data_word_data_rejection_runner(reciever_prefix_model):
+    """Runner for test_invalid_data_word_data_rejection"""
+    reciever_prefix_runner("test_invalid_data_word_data_rejection")
+
+
 if __name__ == "__main__":
-    test_reciever_prefix_runner()
\ No newline at end of file
+    reciever_prefix_build()
+    reciever_prefix_runner()
\ No newline at end of file
@@ -1,7 +1,7 @@
 import cocotb
-from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, Timer
 from cocotb_tools.runner import get_runner
+import os
 
 
 min_range = 4
@@ -13,17 +13,9 @@ counter_size = 8
 async def test_window_filter_basic(dut):
     """Test basic window filtering functionality"""
     
-    # Start clock
-    clock = Clock(dut.i_clk, 10, "ns")
-    clock.start()
-    
-    # Reset
-    dut.i_reset.value = 1
+    # Start from zero
     dut.i_counter_value.value = 0
     await RisingEdge(dut.i_clk)
-    await RisingEdge(dut.i_clk)
-    dut.i_reset.value = 0
-    await RisingEdge(dut.i_clk)
     
     # Test below minimum (should be invalid)
     dut.i_counter_value.value = min_range - 1
@@ -55,76 +47,114 @@ async def test_window_filter_basic(dut):
 async def test_window_filter_boundaries(dut):
     """Test boundary conditions"""
     
-    clock = Clock(dut.i_clk, 10, units="ns")
-    cocotb.start_soon(clock.start())
-    
-    dut.i_reset.value = 1
-    await RisingEdge(dut.i_clk)
-    dut.i_reset.value = 0
     await RisingEdge(dut.i_clk)
     
     # Test all values from 0 to max counter size
     max_val = (2 ** counter_size) - 1  # Assuming 8-bit counter
+    rise = RisingEdge(dut.i_clk)
+    counter_value, valid = dut.i_counter_value, dut.o_valid
+    
+    # Golden results for every value, compared once after the sweep
+    expected = [1 if (min_range <= val <= max_range) else 0 for val in range(max_val + 1)]
+    actual   = []
     
     for val in range(max_val + 1):
-        dut.i_counter_value.value = val
-        await RisingEdge(dut.i_clk)
-        
-        expected_valid = 1 if (min_range <= val <= max_range) else 0
-        actual_valid = int(dut.o_valid.value)
-        
-        assert actual_valid == expected_valid, \
-            f"[T6] Counter={val}: Expected valid={expected_valid}, got {actual_valid}"
+        counter_value.value = val
+        await rise
+        actual.append(int(valid.value))
+    
+    assert actual == expected, \
+        f"[T6] Wrong o_valid at counter values {[val for val, (a, e) in enumerate(zip(actual, expected)) if a != e]}"
 
 @cocotb.test()
 async def test_window_filter_sweep(dut):
     """Sweep through counter values with clock"""
     
-    clock = Clock(dut.i_clk, 10, units="ns")
-    cocotb.start_soon(clock.start())
-    
-    dut.i_reset.value = 1
-    await RisingEdge(dut.i_clk)
-    dut.i_reset.value = 0
+    rise = RisingEdge(dut.i_clk)
+    await rise
     
     # Sweep up
     for i in range(16):
         dut.i_counter_value.value = i
-        await RisingEdge(dut.i_clk)
+        await rise
         dut._log.info(f"[T7] Counter={i}, Valid={dut.o_valid.value}")
     
     # Sweep down
     for i in range(15, -1, -1):
         dut.i_counter_value.value = i
-        await RisingEdge(dut.i_clk)
+        await rise
         dut._log.info(f"[T8] Counter={i}, Valid={dut.o_valid.value}")
 
 
-def test_window_filter_runner():
-    """Runner function for pytest"""
+def window_filter_build():
+    """Build the model once, shared by every testcase"""
     sim = "verilator"  # or "icarus", "questa", etc.
     proj_path = "/home/cody/workspace/mil_adapter"
     print(f"Project Path: {proj_path}")
     
+    # Waveform tracing is off by default. Enable per run with WAVES=1
+    trace = os.environ.get("WAVES", "0") == "1"
+    rebuild = os.environ.get("REBUILD", "0") == "1"
+    if trace:
+        os.environ["TRACES"] = "1"
+    
+    hdl_toplevel = "top_window_filter"
+
     runner = get_runner(sim)
     runner.build(
-        verilog_sources=[f"{proj_path}/src/mylib/window_filter.sv"],
-        hdl_toplevel="window_filter",
-        always=True,
+        verilog_sources=[
+            f"{proj_path}/src/mylib/window_filter.sv",
+            f"{proj_path}/src/mylib/test/top_window_filter.sv",
+        ],
+        hdl_toplevel=hdl_toplevel,
+        build_dir=f"sim_build/{hdl_toplevel}",   # One build per DUT, shared by every testcase
+        clean=rebuild,                            # REBUILD=1 wipes build_dir first
+        timescale=("1ns", "1ps"),                 # Default for every module; none of the sources declare one
         parameters={
             "MIN_VALUE": min_range,
             "MAX_VALUE": max_range,
             "COUNTER_SIZE": counter_size
         },
-        waves=True,
-        build_args=["--trace-fst", "--trace-structs"]
+        waves=trace,
+        build_args=["--timing"] + (["--trace-fst", "--trace-structs"] if trace else [])
     )
-    
+
+
+def window_filter_runner(testcase=None):
+    """Run one testcase, or the whole module, against the built model"""
+    # Waveform tracing is off by default. Enable per run with WAVES=1
+    trace = os.environ.get("WAVES", "0") == "1"
+    if trace:
+        os.environ["TRACES"] = "1"
+    
+    hdl_toplevel = "top_window_filter"
+
+    runner = get_runner("verilator")
     runner.test(
-        hdl_toplevel="window_filter",
+        hdl_toplevel=hdl_toplevel,
+        build_dir=f"sim_build/{hdl_toplevel}",
+        test_dir=f"sim_build/{hdl_toplevel}/{testcase or 'all'}",
+        waves=trace,
         test_module="tbc_window_filter",
+        testcase=testcase,
     )
 
 
+def test_window_filter_basic_runner(window_filter_model):
+    """Runner for test_window_filter_basic"""
+    window_filter_runner("test_window_filter_basic")
+
+
+def test_window_filter_boundaries_runner(window_filter_model):
+    """Runner for test_window_filter_boundaries"""
+    window_filter_runner("test_window_filter_boundaries")
+
+
+def test_window_filter_sweep_runner(window_filter_model):
+    """Runner for test_window_filter_sweep"""
+    window_filter_runner("test_window_filter_sweep")
+
+
 if __name__ == "__main__":
-    test_window_filter_runner()
\ No newline at end of file
+    window_filter_build()
+    window_filter_runner()
\ No newline at end of file
@@ -4,6 +4,13 @@ DATA_WORD    = 1
 
 
 ENABLE_VERBOSE_LOGGING = True
+
+# Manchester chip pairs indexed by bit value. '1' -> High to Low, '0' -> Low to High
+_CHIPS = ((0, 1), (1, 0))
+
+# Sync chip patterns (three chips high/low, three chips low/high)
+_SYNC_CMD  = (1, 1, 1, 0, 0, 0)   # Command Word Sync
+_SYNC_DATA = (0, 0, 0, 1, 1, 1)   # Data Word Sync
  
 def debug(msg: str):
 	if ENABLE_VERBOSE_LOGGING:
@@ -13,41 +20,38 @@ def debug(msg: str):
 
 def debug_list(msg: str, lst: list):
 	if ENABLE_VERBOSE_LOGGING:
-		print(f"{msg}: " + ''.join(str(bit) for bit in lst))
+		# Bits are 0/1, so adding ord('0') gives the ASCII digit directly
+		print(f"{msg}: " + bytes(bit + 48 for bit in lst).decode("ascii"))
 
 
 
 def calculate_odd_parity(data : list[int] | int) -> bool:
-	bit_list = []
+	"""True if data has an odd number of set bits"""
 	if isinstance(data, int):
-		bit_list = msb_int_2_bit_list(data, 16)
-	else:
-		bit_list = data
-
-	return sum(bit_list) % 2 == 1
+		return bool(data.bit_count() & 1)
+	# Count the ones in C without packing the list into an int first
+	return bool(data.count(1) & 1)
 
 
 def msb_int_2_bit_list(value: int, bit_length: int = 0) -> list[int]:
 	"""Convert an integer to a list of bits (MSB first)"""
-	bit_list = []
 	if bit_length == 0:
 		bit_length = value.bit_length()
 	
 	elif bit_length < value.bit_length():
 		raise ValueError("bit_length is too small for the given value")
 
-	for i in range(bit_length - 1, -1, -1):
-		bit_list.append((value >> i) & 1)
-	return bit_list
+	if bit_length == 0:
+		return []
+	# Binary formatting runs in C, one call instead of a shift per bit
+	return list(map(int, f"{value:0{bit_length}b}"))
 
 
 def msb_bit_list_2_int(bit_list: list[int]) -> int:
 	"""Convert a list of bits (MSB first) to an integer"""
-	value = 0
-	bit_length = len(bit_list)
-	for i in range(bit_length):
-		value |= (bit_list[i] << (bit_length - 1 - i))
-	return value
+	if not bit_list:
+		return 0
+	return int(bytes(bit + 48 for bit in bit_list), 2)
 
 
 # Test int_to_bit_array
@@ -65,12 +69,9 @@ def msb_bit_list_2_int(bit_list: list[int]) -> int:
 
 
 
-def generate_sync_pattern(is_command_word : bool) -> list[int]:
+def generate_sync_pattern(is_command_word : bool) -> tuple[int, ...]:
     """Generate sync pattern for command or data word"""
-    if is_command_word:
-        return [1, 1, 1, 0, 0, 0]  # Command Word Sync
-    else:
-        return [0, 0, 0, 1, 1, 1]  # Data Word Sync
+    return _SYNC_CMD if is_command_word else _SYNC_DATA
 	
 
 
@@ -78,11 +79,5 @@ def generate_sync_pattern(is_command_word : bool) -> list[int]:
 def generate_manchester_chip(bit):
     """Generate Manchester encoded chip for a given bit (0 or 1)
        From t=0 point of view, the first half of the bit period is the first element"""
-    if bit == 1:
-        return [1, 0]  # '1' -> High to Low
-    else:
-        return [0, 1]  # '0' -> Low to High
+    return _CHIPS[bit]
     
-
-
-
@@ -0,0 +1,63 @@
+//-----------------------------------------------------------------------------
+// Title      : Down Counter Test Bench Top
+// Project    : MIL-STD-1553 Adapter
+//-----------------------------------------------------------------------------
+// File       : top_down_counter.sv
+// Author     :
+// Company    :
+// Created    :
+// Last update:
+// Platform   :
+// Standard   : SystemVerilog
+// Test Bench : tbc_down_counter.py
+//-----------------------------------------------------------------------------
+// Description:
+// Simulation-only wrapper around the down_counter module. It performs:
+//   - Generation of i_clk inside the simulator
+//   - Pass-through of all down_counter ports to the cocotb test bench
+//-----------------------------------------------------------------------------
+// Copyright (c)
+//-----------------------------------------------------------------------------
+// Revisions  :
+// Date        Version  Author  Description
+//-----------------------------------------------------------------------------
+
+module top_down_counter #(
+    parameter CYCLE_COUNT    = 16,
+    parameter COUNTER_WIDTH  = $clog2(CYCLE_COUNT+1),
+    parameter CLK_PERIOD_NS  = 10                       // Period of i_clk in nanoseconds
+) (
+    input  logic                          i_clear,  // Synchronous clear input
+    input  logic                          i_en   ,  // Enable counting down
+
+    output logic [COUNTER_WIDTH-1:0]      o_count,  // Current count value
+    output logic                          o_busy ,  // High when counting down
+    output logic                          o_done    // High when count reaches zero
+);
+
+// ----------------------------------------------------------------------------
+// Clock Generation
+// ----------------------------------------------------------------------------
+
+    logic i_clk = 1'b0;
+
+    always #(CLK_PERIOD_NS / 2.0) i_clk = ~i_clk;
+
+
+// ----------------------------------------------------------------------------
+// Device Under Test
+// ----------------------------------------------------------------------------
+
+    down_counter #(
+        .CYCLE_COUNT   (CYCLE_COUNT  ),
+        .COUNTER_WIDTH (COUNTER_WIDTH)
+    ) down_counter_uut (
+        .i_clk   (i_clk  ),
+        .i_clear (i_clear),
+        .i_en    (i_en   ),
+        .o_count (o_count),
+        .o_busy  (o_busy ),
+        .o_done  (o_done )
+    );
+
+endmodule // top_down_counter
@@ -0,0 +1,60 @@
+//-----------------------------------------------------------------------------
+// Title      : Edge Detector Test Bench Top
+// Project    : MIL-STD-1553 Adapter
+//-----------------------------------------------------------------------------
+// File       : top_edge_detector.sv
+// Author     :
+// Company    :
+// Created    :
+// Last update:
+// Platform   :
+// Standard   : SystemVerilog
+// Test Bench : tbc_edge_detector.py
+//-----------------------------------------------------------------------------
+// Description:
+// Simulation-only wrapper around the edge_detector module. It performs:
+//   - Generation of i_clk inside the simulator
+//   - Pass-through of all edge_detector ports to the cocotb test bench
+//-----------------------------------------------------------------------------
+// Copyright (c)
+//-----------------------------------------------------------------------------
+// Revisions  :
+// Date        Version  Author  Description
+//-----------------------------------------------------------------------------
+
+module top_edge_detector #(
+    parameter CLK_PERIOD_NS = 10        // Period of i_clk in nanoseconds
+) (
+    input   logic   i_signal,           // Input signal
+
+    output  logic   o_edge_detected,    // High for one clock cycle on any edge
+    output  logic   o_rising_edge,      // High for one clock cycle on rising edge
+    output  logic   o_falling_edge,     // High for one clock cycle on falling edge
+    output  logic   o_prev_signal,      // Previous state of input signal
+    output  logic   o_curr_signal       // Current state of input signal
+);
+
+// ----------------------------------------------------------------------------
+// Clock Generation
+// ----------------------------------------------------------------------------
+
+    logic i_clk = 1'b0;
+
+    always #(CLK_PERIOD_NS / 2.0) i_clk = ~i_clk;
+
+
+// ----------------------------------------------------------------------------
+// Device Under Test
+// ----------------------------------------------------------------------------
+
+    edge_detector edge_detector_uut (
+        .i_clk           (i_clk          ),
+        .i_signal        (i_signal       ),
+        .o_edge_detected (o_edge_detected),
+        .o_rising_edge   (o_rising_edge  ),
+        .o_falling_edge  (o_falling_edge ),
+        .o_prev_signal   (o_prev_signal  ),
+        .o_curr_signal   (o_curr_signal  )
+    );
+
+endmodule // top_edge_detector
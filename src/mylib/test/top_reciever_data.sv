@@ -0,0 +1,74 @@
+//-----------------------------------------------------------------------------
+// Title      : MIL-STD-1553 Data Word Receiver Test Bench Top
+// Project    : MIL-STD-1553 Adapter
+//-----------------------------------------------------------------------------
+// File       : top_reciever_data.sv
+// Author     :
+// Company    :
+// Created    :
+// Last update:
+// Platform   :
+// Standard   : SystemVerilog
+// Test Bench : tbc_reciever_data.py
+//-----------------------------------------------------------------------------
+// Description:
+// Simulation-only wrapper around the reciever_data module. It performs:
+//   - Generation of i_clk inside the simulator
+//   - Pass-through of all reciever_data ports to the cocotb test bench
+//-----------------------------------------------------------------------------
+// Copyright (c)
+//-----------------------------------------------------------------------------
+// Revisions  :
+// Date        Version  Author  Description
+//-----------------------------------------------------------------------------
+
+module top_reciever_data #(
+    parameter CLK_PERIOD_NS = 10                // Period of i_clk in nanoseconds
+) (
+    input   logic        i_reset,               // System Reset
+
+    input   logic        i_rx_in,               // Serial Input Bit
+    input   logic        i_rx_valid,            // Input Bit Valid Signal
+    input   logic        i_clear,               // Clear internal state
+
+    input   logic        i_pre_data_bit,        // Decoded Data Bit from Prefix Decoder
+
+    output  logic        o_busy,                // High when decoding in progress
+    output  logic        o_done,                // High when data reception complete
+    output  logic        o_fail,                // High when data reception failed
+
+    output  logic        o_parity_rx,           // Received Parity Bit
+    output  logic        o_parity_calc,         // Calculated Parity Bit
+
+    output  lib_1553::word_t  o_data_word       // Received Data Word
+);
+
+// ----------------------------------------------------------------------------
+// Clock Generation
+// ----------------------------------------------------------------------------
+
+    logic i_clk = 1'b0;
+
+    always #(CLK_PERIOD_NS / 2.0) i_clk = ~i_clk;
+
+
+// ----------------------------------------------------------------------------
+// Device Under Test
+// ----------------------------------------------------------------------------
+
+    reciever_data reciever_data_uut (
+        .i_clk          (i_clk         ),
+        .i_reset        (i_reset       ),
+        .i_rx_in        (i_rx_in       ),
+        .i_rx_valid     (i_rx_valid    ),
+        .i_clear        (i_clear       ),
+        .i_pre_data_bit (i_pre_data_bit),
+        .o_busy         (o_busy        ),
+        .o_done         (o_done        ),
+        .o_fail         (o_fail        ),
+        .o_parity_rx    (o_parity_rx   ),
+        .o_parity_calc  (o_parity_calc ),
+        .o_data_word    (o_data_word   )
+    );
+
+endmodule // top_reciever_data
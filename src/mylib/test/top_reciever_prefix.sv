@@ -0,0 +1,68 @@
+//-----------------------------------------------------------------------------
+// Title      : MIL-STD-1553 Prefix Receiver Test Bench Top
+// Project    : MIL-STD-1553 Adapter
+//-----------------------------------------------------------------------------
+// File       : top_reciever_prefix.sv
+// Author     :
+// Company    :
+// Created    :
+// Last update:
+// Platform   :
+// Standard   : SystemVerilog
+// Test Bench : tbc_reciever_prefix.py
+//-----------------------------------------------------------------------------
+// Description:
+// Simulation-only wrapper around the reciever_prefix module. It performs:
+//   - Generation of i_clk inside the simulator
+//   - Pass-through of all reciever_prefix ports to the cocotb test bench
+//-----------------------------------------------------------------------------
+// Copyright (c)
+//-----------------------------------------------------------------------------
+// Revisions  :
+// Date        Version  Author  Description
+//-----------------------------------------------------------------------------
+
+module top_reciever_prefix #(
+    parameter CLK_PERIOD_NS = 10    // Period of i_clk in nanoseconds
+) (
+    input   logic   i_reset,        // System Reset
+
+    input   logic   i_rx_in,        // Serial Input Bit
+    input   logic   i_rx_valid,     // Input Bit Valid Signal
+    input   logic   i_clear,        // Clear internal state
+
+    output  logic   o_busy,         // High when decoding in progress
+    output  logic   o_done,         // High when prefix reception complete
+    output  logic   o_fail,         // High when prefix reception failed
+
+    output  logic   o_word_type,    // 0 = Command Word, 1 = Data Word
+    output  logic   o_data_bit      // Decoded Data Bit
+);
+
+// ----------------------------------------------------------------------------
+// Clock Generation
+// ----------------------------------------------------------------------------
+
+    logic i_clk = 1'b0;
+
+    always #(CLK_PERIOD_NS / 2.0) i_clk = ~i_clk;
+
+
+// ----------------------------------------------------------------------------
+// Device Under Test
+// ----------------------------------------------------------------------------
+
+    reciever_prefix reciever_prefix_uut (
+        .i_clk       (i_clk      ),
+        .i_reset     (i_reset    ),
+        .i_rx_in     (i_rx_in    ),
+        .i_rx_valid  (i_rx_valid ),
+        .i_clear     (i_clear    ),
+        .o_busy      (o_busy     ),
+        .o_done      (o_done     ),
+        .o_fail      (o_fail     ),
+        .o_word_type (o_word_type),
+        .o_data_bit  (o_data_bit )
+    );
+
+endmodule // top_reciever_prefix
@@ -0,0 +1,60 @@
+//-----------------------------------------------------------------------------
+// Title      : Window Filter Test Bench Top
+// Project    : MIL-STD-1553 Adapter
+//-----------------------------------------------------------------------------
+// File       : top_window_filter.sv
+// Author     :
+// Company    :
+// Created    :
+// Last update:
+// Platform   :
+// Standard   : SystemVerilog
+// Test Bench : tbc_window_filter.py
+//-----------------------------------------------------------------------------
+// Description:
+// Simulation-only wrapper around the window_filter module. It performs:
+//   - Generation of i_clk inside the simulator
+//   - Pass-through of all window_filter ports to the cocotb test bench
+//
+// window_filter is combinational; the clock only exists so the test bench
+// can pace its stimulus.
+//-----------------------------------------------------------------------------
+// Copyright (c)
+//-----------------------------------------------------------------------------
+// Revisions  :
+// Date        Version  Author  Description
+//-----------------------------------------------------------------------------
+
+module top_window_filter #(
+    parameter MIN_VALUE     = 1,
+    parameter MAX_VALUE     = 2,
+    parameter COUNTER_SIZE  = 2,
+    parameter CLK_PERIOD_NS = 10                        // Period of i_clk in nanoseconds
+) (
+    input  logic [COUNTER_SIZE-1:0] i_counter_value,    // Input counter value to check
+    output logic                    o_valid             // Asserted if i_counter_value is within [MIN_VALUE, MAX_VALUE]
+);
+
+// ----------------------------------------------------------------------------
+// Clock Generation
+// ----------------------------------------------------------------------------
+
+    logic i_clk = 1'b0;
+
+    always #(CLK_PERIOD_NS / 2.0) i_clk = ~i_clk;
+
+
+// ----------------------------------------------------------------------------
+// Device Under Test
+// ----------------------------------------------------------------------------
+
+    window_filter #(
+        .MIN_VALUE    (MIN_VALUE   ),
+        .MAX_VALUE    (MAX_VALUE   ),
+        .COUNTER_SIZE (COUNTER_SIZE)
+    ) window_filter_uut (
+        .i_counter_value (i_counter_value),
+        .o_valid         (o_valid        )
+    );
+
+endmodule // top_window_filter